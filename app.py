@@ -1,12 +1,16 @@
 import sys
 import os
-import json # Import json to dump the swagger_blueprint
-from flask import Flask, jsonify
+import atexit
+from flask import Flask, Response, jsonify, request
 from flask_swagger_ui import get_swaggerui_blueprint # Import Flask-Swagger-UI
 from src.apps.routes.user_route import user_bp
 from src.middlewares.error_middleware import register_error_handlers
+from src.middlewares.auth_middleware import init_auth
 from src.apps.repositories.user_repository import UserRepository
-from src.infrastructures.config.swagger_config import SWAGGER_URL, API_URL, swagger_blueprint # Import your Swagger config 
+from src.apps.usecases.user_usecase import UserUseCase
+from src.apps.controllers.user_controller import UserController
+from src.infrastructures.serialization.orjson_provider import ORJSONProvider
+from src.infrastructures.config.swagger_config import SWAGGER_URL, API_URL, get_swagger_json # Import your Swagger config
 from flask_cors import CORS
 
 # Add src to the Python path for imports
@@ -33,21 +37,39 @@ app.register_blueprint(swaggerui_blueprint, url_prefix=SWAGGER_URL)
 @app.route(API_URL)
 def swagger_spec():
     """
-    Serves the OpenAPI specification as JSON.
+    Serves the pre-serialized OpenAPI specification as JSON.
+    Answers 304 Not Modified when the client already holds the current version.
     """
-    return jsonify(swagger_blueprint)
+    spec_json, etag = get_swagger_json()
+    response = Response(spec_json, mimetype='application/json', headers={'Cache-Control': 'public, max-age=3600'})
+    response.set_etag(etag)
+    return response.make_conditional(request)
 # --- End Swagger UI Config ---
 
 
+def init_app(app):
+    """
+    Installs the orjson JSON provider and loads auth settings, then builds the repository,
+    usecase and controller exactly once and stores them in app.extensions, where user_route
+    resolves the controller on each request.
+    """
+    # Every jsonify(), request.get_json() and error handler response goes through orjson
+    app.json_provider_class = ORJSONProvider
+    app.json = ORJSONProvider(app)
+    init_auth()
+    repo = UserRepository()
+    app.extensions['user_repo'] = repo
+    app.extensions['user_controller'] = UserController(UserUseCase(repo))
+
+
 # Register other blueprints
 app.register_blueprint(user_bp)
 
 # Register custom error handlers
 register_error_handlers(app)
 
-# Store the UserRepository instance in app config for consistent access and proper teardown
-with app.app_context():
-    app.config['USER_REPOSITORY_INSTANCE'] = UserRepository()
+# Create the single shared UserRepository (and its connection pool)
+init_app(app)
 
 # Health check endpoint
 @app.route('/')
@@ -57,19 +79,26 @@ def health_check():
     """
     return jsonify({'status': 'success', 'message': 'Server is running'}), 200
 
-# Teardown context to close database connection
-@app.teardown_appcontext
-def close_db_connection(exception=None):
+# Close the database connection pool on shutdown
+@atexit.register
+def close_db_connection():
     """
-    Closes the database connection when the application context tears down.
-    Ensures that the SQLite connection is properly closed after each request or app shutdown.
+    Closes the shared database connection pool when the process exits.
+    The pool serves every request, so it must outlive individual application contexts.
     """
-    repo = app.config.get('USER_REPOSITORY_INSTANCE')
+    repo = app.extensions.pop('user_repo', None)
     if repo:
         repo.close_connection()
-        app.config['USER_REPOSITORY_INSTANCE'] = None
-        app.logger.info("Database connection closed.")
-    if exception:
+        app.logger.info("Database connection pool closed.")
+
+@app.teardown_appcontext
+def log_teardown_exception(exception=None):
+    """
+    Logs the exception, if any, that ended the application context.
+    GeneratorExit is skipped: it only means a client disconnected while a
+    streamed response (e.g. GET /api/users) was still being sent.
+    """
+    if exception and not isinstance(exception, GeneratorExit):
         app.logger.error(f"App context teardown with exception: {exception}")
 
 
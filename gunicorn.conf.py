@@ -0,0 +1,22 @@
+# gunicorn.conf.py
+# Production server settings. Start with: gunicorn -c gunicorn.conf.py app:app
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+# One process per core (plus spare) with a few threads each, instead of
+# Werkzeug's single-process development server.
+# Threads rather than an async (ASGI/uvloop) stack: every handler blocks on SQLite
+# or bcrypt, which an event loop would have to push onto threads anyway, and both
+# release the GIL, so threaded workers already overlap that I/O and hashing.
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+worker_class = 'gthread'
+# WEB_THREADS is also read by the SQLite pool, which opens one reader connection per thread.
+threads = int(os.environ.get('WEB_THREADS', 4))
+
+# The app is not preloaded: importing it opens the SQLite connection pool, and
+# SQLite connections must not be carried across fork(). Each worker opens its own
+# pool instead; with mmap_size set on every connection, workers still share the
+# database's hot pages through the OS page cache.
+preload_app = False
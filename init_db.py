@@ -1,8 +1,10 @@
 import sqlite3
-from werkzeug.security import generate_password_hash
+from concurrent.futures import ThreadPoolExecutor
+from src.apps.utils.passwords import hash_password
 
 conn = sqlite3.connect('users.db')
 cursor = conn.cursor()
+cursor.execute("PRAGMA journal_mode=WAL")
 
 cursor.execute('''
 CREATE TABLE IF NOT EXISTS users (
@@ -13,14 +15,20 @@ CREATE TABLE IF NOT EXISTS users (
 )
 ''')
 
-# Hash passwords before inserting sample users
 sample_users = [
-    ('John Doe', 'john@example.com', generate_password_hash('password123')),
-    ('Jane Smith', 'jane@example.com', generate_password_hash('secret456')),
-    ('Bob Johnson', 'bob@example.com', generate_password_hash('qwerty789'))
+    ('John Doe', 'john@example.com', 'password123'),
+    ('Jane Smith', 'jane@example.com', 'secret456'),
+    ('Bob Johnson', 'bob@example.com', 'qwerty789')
 ]
 
+# Hash passwords before inserting sample users.
+# bcrypt releases the GIL while hashing, so the hashes are computed in parallel.
+with ThreadPoolExecutor() as executor:
+    hashed_passwords = list(executor.map(lambda user: hash_password(user[2], rounds=10), sample_users))
+sample_users = [(name, email, hashed) for (name, email, _), hashed in zip(sample_users, hashed_passwords)]
+
 # Use INSERT OR IGNORE to prevent errors if the script is run multiple times
+cursor.execute("BEGIN IMMEDIATE")
 cursor.executemany("INSERT OR IGNORE INTO users (name, email, password) VALUES (?, ?, ?)", sample_users)
 conn.commit()
 conn.close()
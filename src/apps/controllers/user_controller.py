@@ -1,13 +1,46 @@
-from flask import request, jsonify
+from flask import request, jsonify, current_app, stream_with_context
 from src.middlewares.auth_middleware import token_required
 from src.apps.utils.validators import validate_user_payload
 import sqlite3 # Import sqlite3 to catch IntegrityError directly
 import logging # For logging internal errors
+import os
+from functools import partial
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+# LOG_LEVEL (e.g. WARNING in production) controls verbosity; messages use %-style
+# arguments so they are only formatted when the level is enabled.
+logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO').upper())
 logger = logging.getLogger(__name__)
 
+# Number of rows serialized per chunk when streaming a JSON array
+STREAM_CHUNK_ROWS = 256
+
+def _stream_json_array(items):
+    """
+    Serializes an iterable of dicts as a JSON array, yielding it in chunks
+    so the full list never has to be materialized in memory.
+    """
+    dumps = partial(current_app.json.dumps, separators=(',', ':'))
+    yield '['
+    chunk = []
+    first = True
+    for item in items:
+        chunk.append(dumps(item) if first else ',' + dumps(item))
+        first = False
+        if len(chunk) >= STREAM_CHUNK_ROWS:
+            yield ''.join(chunk)
+            chunk = []
+    chunk.append(']')
+    yield ''.join(chunk)
+
+def _prepend(first, rest):
+    """
+    Yields `first`, then everything left in the `rest` generator.
+    `yield from` forwards close() to `rest` when the client disconnects mid-stream.
+    """
+    yield first
+    yield from rest
+
 class UserController:
     """
     Controller for handling user-related API requests.
@@ -22,11 +55,18 @@ class UserController:
         Retrieves all users. Requires authentication.
         """
         try:
-            logger.info(f"User {current_user['email']} requesting all users.")
-            users = self.usecase.get_all_users()
-            return jsonify([u.to_dict() for u in users]), 200
+            logger.info("User %s requesting all users.", current_user['email'])
+            users = self.usecase.iter_all_users()
+            # Pull the first row here so the query runs inside this try: once the
+            # stream starts, the 200 status is already sent and errors can't be reported
+            first = next(users, None)
+            if first is not None:
+                users = _prepend(first, users)
+            return current_app.response_class(
+                stream_with_context(_stream_json_array(users)), mimetype='application/json'
+            ), 200
         except Exception as e:
-            logger.error(f"Error getting all users: {e}", exc_info=True)
+            logger.error("Error getting all users: %s", e, exc_info=True)
             return jsonify({'error': 'Failed to retrieve users', 'details': 'An internal server error occurred.'}), 500
 
     @token_required
@@ -37,7 +77,7 @@ class UserController:
         try:
             # Flask's route conversion handles user_id to int, but defensive check is good
             user_id = int(user_id)
-            logger.info(f"User {current_user['email']} requesting user ID: {user_id}")
+            logger.info("User %s requesting user ID: %s", current_user['email'], user_id)
             user = self.usecase.get_user(user_id)
             if not user:
                 return jsonify({'error': 'User not found'}), 404
@@ -45,7 +85,7 @@ class UserController:
         except ValueError:
             return jsonify({'error': 'Invalid user ID format. Must be an integer.'}), 400
         except Exception as e:
-            logger.error(f"Error getting user {user_id}: {e}", exc_info=True)
+            logger.error("Error getting user %s: %s", user_id, e, exc_info=True)
             return jsonify({'error': 'Failed to retrieve user', 'details': 'An internal server error occurred.'}), 500
 
     def create_user(self):
@@ -54,7 +94,7 @@ class UserController:
         Includes input validation and error handling for duplicates.
         """
         data = request.get_json()
-        logger.info(f"Attempting to create user with data: {data}")
+        logger.info("Attempting to create user with data: %s", data)
 
         # Input validation
         errors = validate_user_payload(data, create=True)
@@ -67,18 +107,18 @@ class UserController:
             password = data.get('password')
 
             self.usecase.create_user(name, email, password)
-            logger.info(f"User {email} created successfully.")
+            logger.info("User %s created successfully.", email)
             return jsonify({'message': 'User created successfully'}), 201 # 201 Created
         except sqlite3.IntegrityError:
             # Specific error for unique constraint violation (duplicate email)
-            logger.warning(f"Attempt to create user with existing email: {email}")
+            logger.warning("Attempt to create user with existing email: %s", email)
             return jsonify({'error': 'User with this email already exists'}), 409 # Conflict
         except KeyError as e:
             # Should be caught by validate_user_payload, but defensive check
-            logger.error(f"Missing expected data field: {e}", exc_info=True)
+            logger.error("Missing expected data field: %s", e, exc_info=True)
             return jsonify({'error': f'Missing data field: {e}'}), 400
         except Exception as e:
-            logger.error(f"Failed to create user: {e}", exc_info=True)
+            logger.error("Failed to create user: %s", e, exc_info=True)
             return jsonify({'error': 'Failed to create user', 'details': 'An internal server error occurred.'}), 500
 
     @token_required
@@ -88,7 +128,7 @@ class UserController:
         Includes input validation.
         """
         data = request.get_json()
-        logger.info(f"User {current_user['email']} attempting to update user ID: {user_id} with data: {data}")
+        logger.info("User %s attempting to update user ID: %s with data: %s", current_user['email'], user_id, data)
 
         # Input validation (for update, 'create' is False as fields are optional)
         errors = validate_user_payload(data, create=False)
@@ -105,21 +145,20 @@ class UserController:
             if not any([name, email, password]):
                 return jsonify({'error': 'No fields provided for update'}), 400
 
-            # Get the user first to check existence
-            user_exists = self.usecase.get_user(user_id)
-            if not user_exists:
+            # The UPDATE's row count doubles as the existence check
+            rowcount = self.usecase.update_user(user_id, name, email, password)
+            if rowcount == 0:
                 return jsonify({'error': 'User not found for update'}), 404
 
-            self.usecase.update_user(user_id, name, email, password)
-            logger.info(f"User ID {user_id} updated successfully by {current_user['email']}.")
+            logger.info("User ID %s updated successfully by %s.", user_id, current_user['email'])
             return jsonify({'message': 'User updated successfully'}), 200
         except ValueError:
             return jsonify({'error': 'Invalid user ID format. Must be an integer.'}), 400
         except sqlite3.IntegrityError:
-            logger.warning(f"Attempt to update user {user_id} with existing email: {email}")
+            logger.warning("Attempt to update user %s with existing email: %s", user_id, email)
             return jsonify({'error': 'Email already exists for another user'}), 409
         except Exception as e:
-            logger.error(f"Failed to update user {user_id}: {e}", exc_info=True)
+            logger.error("Failed to update user %s: %s", user_id, e, exc_info=True)
             return jsonify({'error': 'Failed to update user', 'details': 'An internal server error occurred.'}), 500
 
     @token_required
@@ -129,18 +168,17 @@ class UserController:
         """
         try:
             user_id = int(user_id) # Ensure user_id is integer
-            logger.info(f"User {current_user['email']} attempting to delete user ID: {user_id}")
-            user_exists = self.usecase.get_user(user_id)
-            if not user_exists: 
-                return jsonify({'error': 'User not found for deletion'}), 404  
+            logger.info("User %s attempting to delete user ID: %s", current_user['email'], user_id)
+            rowcount = self.usecase.delete_user(user_id)
+            if rowcount == 0:
+                return jsonify({'error': 'User not found for deletion'}), 404
 
-            self.usecase.delete_user(user_id)
-            logger.info(f"User ID {user_id} deleted successfully by {current_user['email']}.")
+            logger.info("User ID %s deleted successfully by %s.", user_id, current_user['email'])
             return jsonify({'message': 'User deleted successfully'}), 200
         except ValueError:
             return jsonify({'error': 'Invalid user ID format. Must be an integer.'}), 400
         except Exception as e:
-            logger.error(f"Failed to delete user {user_id}: {e}", exc_info=True)
+            logger.error("Failed to delete user %s: %s", user_id, e, exc_info=True)
             return jsonify({'error': 'Failed to delete user', 'details': 'An internal server error occurred.'}), 500
 
     @token_required
@@ -149,16 +187,16 @@ class UserController:
         Searches users by name. Requires authentication.
         """
         name = request.args.get('name')
-        logger.info(f"User {current_user['email']} searching for users with name: {name}")
+        logger.info("User %s searching for users with name: %s", current_user['email'], name)
 
         if not name:
             return jsonify({'error': 'Search term "name" query parameter is required'}), 400
 
         try:
             users = self.usecase.search_user(name)
-            return jsonify([u.to_dict() for u in users]), 200
+            return jsonify(users), 200
         except Exception as e:
-            logger.error(f"Failed to search users by name '{name}': {e}", exc_info=True)
+            logger.error("Failed to search users by name '%s': %s", name, e, exc_info=True)
             return jsonify({'error': 'Failed to search users', 'details': 'An internal server error occurred.'}), 500
 
     def login_user(self):
@@ -166,7 +204,7 @@ class UserController:
         Authenticates a user and returns a JWT token. Does NOT require authentication.
         """
         data = request.get_json()
-        logger.info(f"Attempting login for email: {data.get('email')}")
+        logger.info("Attempting login for email: %s", data.get('email'))
 
         if not data:
             return jsonify({'error': 'No login data provided'}), 400
@@ -180,10 +218,10 @@ class UserController:
         try:
             token = self.usecase.login_user(email, password)
             if token:
-                logger.info(f"User {email} logged in successfully.")
+                logger.info("User %s logged in successfully.", email)
                 return jsonify({'token': token}), 200
-            logger.warning(f"Failed login attempt for email: {email} - Invalid credentials.")
+            logger.warning("Failed login attempt for email: %s - Invalid credentials.", email)
             return jsonify({'error': 'Invalid credentials'}), 401
         except Exception as e:
-            logger.error(f"Login failed for email {email}: {e}", exc_info=True)
+            logger.error("Login failed for email %s: %s", email, e, exc_info=True)
             return jsonify({'error': 'Login failed', 'details': 'An internal server error occurred.'}), 500
\ No newline at end of file
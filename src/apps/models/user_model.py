@@ -2,6 +2,9 @@ class User:
     """
     Represents a User entity.
     """
+    # No per-instance __dict__: smaller objects and faster attribute access
+    __slots__ = ('user_id', 'name', 'email', 'password')
+
     def __init__(self, user_id, name, email, password):
         self.user_id = user_id
         self.name = name
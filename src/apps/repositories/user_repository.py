@@ -1,5 +1,7 @@
 import sqlite3
+import sys
 from src.apps.models.user_model import User
+from src.infrastructures.database.sqlite_pool import SQLitePool
 import logging
 
 logger = logging.getLogger(__name__)
@@ -9,47 +11,78 @@ class UserRepository:
     Handles data access operations for the User entity using SQLite.
     Manages database connection and CRUD operations.
     """
+    # Statements are defined once and interned so every call hands sqlite3 the
+    # same string object, which its per-connection statement cache looks up.
+    # Keyset pagination over the rowid, used to stream the user list in batches
+    SQL_GET_ALL_AFTER_ID = sys.intern('SELECT id, name, email FROM users WHERE id > ? ORDER BY id LIMIT ?')
+    SQL_GET_BY_ID = sys.intern('SELECT id, name, email, password FROM users WHERE id=?')
+    # The planner prefers the UNIQUE autoindex on email, which still needs a table lookup,
+    # so the covering index is named explicitly.
+    SQL_GET_BY_EMAIL = sys.intern(
+        'SELECT id, name, email, password FROM users INDEXED BY idx_users_email_cover WHERE email=?'
+    )
+    SQL_GET_LOGIN_ROW = sys.intern(
+        'SELECT id, password FROM users INDEXED BY idx_users_email_cover WHERE email=?'
+    )
+    SQL_SEARCH_BY_NAME = sys.intern(
+        'SELECT u.id, u.name, u.email FROM users_fts JOIN users u ON u.id = users_fts.rowid '
+        'WHERE users_fts.name LIKE ?'
+    )
+    SQL_INSERT = sys.intern('INSERT INTO users (name, email, password) VALUES (?, ?, ?)')
+    SQL_DELETE = sys.intern('DELETE FROM users WHERE id=?')
+
+    # Rows fetched per pooled-connection checkout when iterating over all users
+    LIST_BATCH_ROWS = 500
+
     def __init__(self):
-        # Use check_same_thread=False for Flask dev server to allow multiple threads
-        # to use the same connection. For production, consider connection pools.
+        # Each request borrows its own connection from a WAL-mode pool,
+        # so reads no longer queue behind writes on a single shared connection.
         try:
-            self.conn = sqlite3.connect('users.db', check_same_thread=False)
-            self.conn.row_factory = sqlite3.Row # Allows accessing columns by name
+            self.pool = SQLitePool('users.db')
             self.create_table()
-            logger.info("Database connection established and table checked.")
+            logger.info("Database connection pool established and table checked.")
         except sqlite3.Error as e:
             logger.critical(f"Failed to connect to database: {e}", exc_info=True)
             raise # Re-raise to prevent app from starting without DB
 
-    def _execute_query(self, query, params=(), fetch_one=False, fetch_all=False):
+    def _execute_query(self, query, params=(), fetch_one=False, fetch_all=False, write=False, fetch_rowcount=False):
         """
         Helper method to execute SQL queries with error handling and transaction management.
-        """
-        cursor = None
-        try:
-            cursor = self.conn.cursor()
-            cursor.execute(query, params)
-            self.conn.commit() # Commit changes after successful execution
-            if fetch_one:
-                return cursor.fetchone()
-            if fetch_all:
-                return cursor.fetchall()
-            return None
-        except sqlite3.IntegrityError as e:
-            self.conn.rollback() # Rollback on integrity error (e.g., unique constraint violation)
-            logger.error(f"SQLite Integrity Error: {e} | Query: {query} | Params: {params}", exc_info=True)
-            raise # Re-raise for controller to handle specific error
-        except sqlite3.Error as e:
-            self.conn.rollback() # Rollback on any other SQLite error
-            logger.error(f"SQLite Database Error: {e} | Query: {query} | Params: {params}", exc_info=True)
-            raise Exception(f"Database operation failed: {e}") from e # Wrap and re-raise
-        finally:
-            if cursor:
-                cursor.close()
+        Only mutations (write=True) are committed; reads skip the commit and rollback entirely.
+        With fetch_rowcount=True the number of rows affected by the statement is returned.
+        """
+        with self.pool.acquire(write=write) as conn:
+            cursor = None
+            try:
+                cursor = conn.cursor()
+                cursor.execute(query, params)
+                if write:
+                    conn.commit() # Commit changes after successful execution
+                if fetch_one:
+                    return cursor.fetchone()
+                if fetch_all:
+                    return cursor.fetchall()
+                if fetch_rowcount:
+                    return cursor.rowcount
+                return None
+            except sqlite3.IntegrityError as e:
+                if conn.in_transaction: # Reads never open a transaction, so there is nothing to undo
+                    conn.rollback() # Rollback on integrity error (e.g., unique constraint violation)
+                logger.error(f"SQLite Integrity Error: {e} | Query: {query} | Params: {params}", exc_info=True)
+                raise # Re-raise for controller to handle specific error
+            except sqlite3.Error as e:
+                if conn.in_transaction:
+                    conn.rollback() # Rollback on any other SQLite error
+                logger.error(f"SQLite Database Error: {e} | Query: {query} | Params: {params}", exc_info=True)
+                raise Exception(f"Database operation failed: {e}") from e # Wrap and re-raise
+            finally:
+                if cursor:
+                    cursor.close()
 
     def create_table(self):
         """
-        Creates the users table if it doesn't exist.
+        Creates the users table if it doesn't exist, along with the covering email index,
+        the FTS5 index on user names and the triggers that keep it in sync with the table.
         """
         query = '''
             CREATE TABLE IF NOT EXISTS users (
@@ -59,22 +92,70 @@ class UserRepository:
                 password TEXT NOT NULL
             )
         '''
-        self._execute_query(query)
+        self._execute_query(query, write=True)
 
-    def get_all_users(self):
-        """
-        Retrieves all users from the database.
-        Returns a list of User objects.
-        """
-        rows = self._execute_query('SELECT id, name, email, password FROM users', fetch_all=True)
-        return [User(row['id'], row['name'], row['email'], row['password']) for row in rows] if rows else []
+        # Covering index for login lookups: every column selected by email is
+        # stored in the index, so the query never has to visit the table itself.
+        self._execute_query(
+            'CREATE INDEX IF NOT EXISTS idx_users_email_cover ON users(email, id, name, password)', write=True
+        )
+
+        fts_exists = self._execute_query(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='users_fts'", fetch_one=True
+        )
+        # The trigram tokenizer indexes every 3-character substring, so
+        # "name contains X" searches can use the index instead of a full scan.
+        fts_queries = [
+            '''
+            CREATE VIRTUAL TABLE IF NOT EXISTS users_fts
+            USING fts5(name, content='users', content_rowid='id', tokenize='trigram')
+            ''',
+            '''
+            CREATE TRIGGER IF NOT EXISTS users_fts_ai AFTER INSERT ON users BEGIN
+                INSERT INTO users_fts(rowid, name) VALUES (new.id, new.name);
+            END
+            ''',
+            '''
+            CREATE TRIGGER IF NOT EXISTS users_fts_ad AFTER DELETE ON users BEGIN
+                INSERT INTO users_fts(users_fts, rowid, name) VALUES ('delete', old.id, old.name);
+            END
+            ''',
+            '''
+            CREATE TRIGGER IF NOT EXISTS users_fts_au AFTER UPDATE OF name ON users BEGIN
+                INSERT INTO users_fts(users_fts, rowid, name) VALUES ('delete', old.id, old.name);
+                INSERT INTO users_fts(rowid, name) VALUES (new.id, new.name);
+            END
+            ''',
+        ]
+        for fts_query in fts_queries:
+            self._execute_query(fts_query, write=True)
+        if not fts_exists:
+            # Index users that were inserted before the FTS table existed
+            self._execute_query("INSERT INTO users_fts(users_fts) VALUES ('rebuild')", write=True)
+
+    def iter_all_users_dict(self):
+        """
+        Lazily yields every user as a public dict ({'id', 'name', 'email'}), in id order.
+        Rows are fetched in batches of LIST_BATCH_ROWS, and the pooled connection is
+        released before each batch is yielded, so a slow consumer (e.g. a streaming
+        response to a slow client) never keeps a reader checked out.
+        """
+        last_id = 0 # AUTOINCREMENT ids start at 1
+        batch_size = self.LIST_BATCH_ROWS
+        while True:
+            rows = self._execute_query(self.SQL_GET_ALL_AFTER_ID, (last_id, batch_size), fetch_all=True)
+            for row in rows:
+                yield {'id': row['id'], 'name': row['name'], 'email': row['email']}
+            if len(rows) < batch_size:
+                return
+            last_id = rows[-1]['id']
 
     def get_user_by_id(self, user_id):
         """
         Retrieves a single user by their ID.
         Returns a User object or None if not found.
         """
-        row = self._execute_query('SELECT id, name, email, password FROM users WHERE id=?', (user_id,), fetch_one=True)
+        row = self._execute_query(self.SQL_GET_BY_ID, (user_id,), fetch_one=True)
         return User(row['id'], row['name'], row['email'], row['password']) if row else None
 
     def create_user(self, name, email, password):
@@ -82,12 +163,12 @@ class UserRepository:
         Inserts a new user into the database.
         Expected to raise sqlite3.IntegrityError if email already exists (handled in controller).
         """
-        query = 'INSERT INTO users (name, email, password) VALUES (?, ?, ?)'
-        self._execute_query(query, (name, email, password))
+        self._execute_query(self.SQL_INSERT, (name, email, password), write=True)
 
     def update_user(self, user_id, name=None, email=None, password=None):
         """
         Updates an existing user's details. Only updates provided (non-None) fields.
+        Returns the number of rows updated (0 if the user does not exist).
         Raises sqlite3.IntegrityError if new email already exists.
         """
         updates = []
@@ -104,41 +185,50 @@ class UserRepository:
 
         if not updates:
             logger.info(f"No fields provided to update for user ID: {user_id}")
-            return # No fields to update
+            return 0 # No fields to update
 
         query = f'UPDATE users SET {", ".join(updates)} WHERE id=?'
         params.append(user_id)
-        self._execute_query(query, tuple(params))
+        return self._execute_query(query, tuple(params), write=True, fetch_rowcount=True)
 
 
     def delete_user(self, user_id):
         """
         Deletes a user from the database by ID.
+        Returns the number of rows deleted (0 if the user does not exist).
         """
-        query = 'DELETE FROM users WHERE id=?'
-        self._execute_query(query, (user_id,))
+        return self._execute_query(self.SQL_DELETE, (user_id,), write=True, fetch_rowcount=True)
 
     def get_user_by_email(self, email):
         """
         Retrieves a single user by their email address.
         Returns a User object or None if not found.
         """
-        row = self._execute_query('SELECT id, name, email, password FROM users WHERE email=?', (email,), fetch_one=True)
+        row = self._execute_query(self.SQL_GET_BY_EMAIL, (email,), fetch_one=True)
         return User(row['id'], row['name'], row['email'], row['password']) if row else None
 
-    def search_users_by_name(self, name):
+    def get_login_row(self, email):
+        """
+        Retrieves only what login needs for an email address.
+        Returns an (id, password_hash) tuple or None if not found.
+        """
+        row = self._execute_query(self.SQL_GET_LOGIN_ROW, (email,), fetch_one=True)
+        return (row['id'], row['password']) if row else None
+
+    def search_users_by_name_public(self, name):
         """
         Searches for users whose name contains the given string (case-insensitive).
-        Returns a list of User objects.
+        Uses the users_fts trigram index; terms shorter than 3 characters fall back to scanning it.
+        Returns a list of public dicts ({'id', 'name', 'email'}); no User objects are built.
         """
-        query = 'SELECT id, name, email, password FROM users WHERE LOWER(name) LIKE ?'
-        rows = self._execute_query(query, ('%' + name.lower() + '%',), fetch_all=True)
-        return [User(row['id'], row['name'], row['email'], row['password']) for row in rows] if rows else []
+        rows = self._execute_query(self.SQL_SEARCH_BY_NAME, ('%' + name + '%',), fetch_all=True)
+        return [{'id': row['id'], 'name': row['name'], 'email': row['email']} for row in rows] if rows else []
 
     def close_connection(self):
         """
-        Closes the database connection.
+        Closes every pooled database connection.
         """
-        if self.conn:
-            self.conn.close()
-            logger.info("UserRepository database connection explicitly closed.")
\ No newline at end of file
+        if self.pool:
+            self.pool.close()
+            self.pool = None
+            logger.info("UserRepository database connection pool explicitly closed.")
\ No newline at end of file
@@ -1,8 +1,10 @@
-import jwt
+import base64
+import hmac
 import os
-from werkzeug.security import generate_password_hash, check_password_hash
+import orjson
 from dotenv import load_dotenv
 import logging
+from src.apps.utils.passwords import hash_password, verify_password
 
 logger = logging.getLogger(__name__)
 
@@ -18,19 +20,43 @@ if SECRET_KEY == 'default-flask-secret-key-change-me':
 if JWT_SECRET_KEY == 'default-jwt-secret-key-change-me':
     logger.warning("JWT_SECRET_KEY not set in .env. Using default. Please set a strong, random key.")
 
+# Encoded once so token signing doesn't convert the key from str on every call
+JWT_SECRET_KEY_BYTES = JWT_SECRET_KEY.encode()
+
+# Tokens are always signed with HS256, so the encoded header never changes:
+# base64url('{"alg":"HS256","typ":"JWT"}'), the same header PyJWT emits.
+_JWT_HEADER_B64 = b'eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9'
+# HMAC keyed once at import; each signature copies it instead of redoing the key setup.
+_HMAC_TEMPLATE = hmac.new(JWT_SECRET_KEY_BYTES, digestmod='sha256')
+
+def _b64url(data):
+    """
+    Unpadded base64url encoding, as used by JWT.
+    """
+    return base64.urlsafe_b64encode(data).rstrip(b'=')
+
+def _encode_token(payload):
+    """
+    Signs a payload as an HS256 JWT and returns the token string.
+    """
+    signing_input = _JWT_HEADER_B64 + b'.' + _b64url(orjson.dumps(payload))
+    mac = _HMAC_TEMPLATE.copy()
+    mac.update(signing_input)
+    return (signing_input + b'.' + _b64url(mac.digest())).decode('ascii')
+
 class UserUseCase:
     """
     Business logic layer for User operations.
-    Interacts with UserRepository and handles password hashing/JWT generation.
+    Interacts with UserRepository and handles password hashing (bcrypt)/JWT generation.
     """
     def __init__(self, user_repo):
         self.user_repo = user_repo
 
-    def get_all_users(self):
+    def iter_all_users(self):
         """
-        Fetches all user records.
+        Lazily yields all users as public dicts, for streaming responses.
         """
-        return self.user_repo.get_all_users()
+        return self.user_repo.iter_all_users_dict()
 
     def get_user(self, user_id):
         """
@@ -46,48 +72,49 @@ class UserUseCase:
         if not all([name, email, password]):
             # This should ideally be caught by validator, but defensive check
             raise ValueError("All fields (name, email, password) are required to create a user.")
-        # Use pbkdf2:sha256 as a more secure default method for hashing
-        hashed_password = generate_password_hash(password, method='pbkdf2:sha256')
+        # bcrypt runs its key schedule in native code, unlike Werkzeug's pbkdf2
+        hashed_password = hash_password(password)
         self.user_repo.create_user(name, email, hashed_password)
 
     def update_user(self, user_id, name=None, email=None, password=None):
         """
         Updates an existing user's details. Only updates provided fields.
         Password will be re-hashed if provided.
+        Returns the number of rows updated (0 if the user does not exist).
         Raises ValueError if no fields are provided for update.
         """
         if not any([name, email, password]):
             raise ValueError("At least one field (name, email, or password) must be provided for update.")
 
         # Hash password only if it's provided for update
-        hashed_password = generate_password_hash(password, method='pbkdf2:sha256') if password else None
-        self.user_repo.update_user(user_id, name, email, hashed_password)
+        hashed_password = hash_password(password) if password else None
+        return self.user_repo.update_user(user_id, name, email, hashed_password)
 
     def delete_user(self, user_id):
         """
         Deletes a user by ID.
+        Returns the number of rows deleted (0 if the user does not exist).
         """
-        self.user_repo.delete_user(user_id)
+        return self.user_repo.delete_user(user_id)
 
     def search_user(self, name):
         """
         Searches for users by name.
+        Returns public dicts (no password hashes).
         """
-        return self.user_repo.search_users_by_name(name)
+        return self.user_repo.search_users_by_name_public(name)
 
     def login_user(self, email, password):
         """
         Authenticates a user and generates a JWT token upon successful login.
         Returns the token string or None if authentication fails.
         """
-        user = self.user_repo.get_user_by_email(email)
-        if user and check_password_hash(user.password, password):
-            # Using JWT_SECRET_KEY for signing tokens for clarity and security separation
-            token = jwt.encode(
-                {'id': user.user_id, 'email': user.email},
-                JWT_SECRET_KEY,
-                algorithm='HS256'
-            )
-            # jwt.encode returns bytes, often needs to be decoded for Flask jsonify
-            return token
-        return None
\ No newline at end of file
+        # Fetch only the id and hash; no User object is built for failed attempts
+        row = self.user_repo.get_login_row(email)
+        if not row:
+            return None
+        user_id, password_hash = row
+        if not verify_password(password_hash, password):
+            return None
+        # Using JWT_SECRET_KEY for signing tokens for clarity and security separation
+        return _encode_token({'id': user_id, 'email': email})
@@ -0,0 +1,24 @@
+import bcrypt
+from werkzeug.security import check_password_hash
+
+# bcrypt only looks at the first 72 bytes of a password and newer releases
+# raise instead of truncating silently, so truncate explicitly on both sides.
+BCRYPT_MAX_BYTES = 72
+
+def hash_password(password, rounds=12):
+    """
+    Hashes a password with bcrypt.
+    Returns the hash as a string, ready to be stored in the users table.
+    """
+    hashed = bcrypt.hashpw(password.encode()[:BCRYPT_MAX_BYTES], bcrypt.gensalt(rounds=rounds))
+    return hashed.decode('ascii')
+
+def verify_password(hashed_password, password):
+    """
+    Checks a plaintext password against a stored hash.
+    Hashes created before the switch to bcrypt (Werkzeug's pbkdf2/scrypt format)
+    are still verified through Werkzeug so existing accounts keep working.
+    """
+    if hashed_password.startswith('$2'):
+        return bcrypt.checkpw(password.encode()[:BCRYPT_MAX_BYTES], hashed_password.encode('ascii'))
+    return check_password_hash(hashed_password, password)
@@ -0,0 +1,102 @@
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Applied once to every pooled connection right after it is opened.
+# WAL lets readers proceed while a write is in progress, and the remaining
+# pragmas keep hot pages in memory instead of re-reading them from disk.
+CONNECTION_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA cache_size=-20000',
+    'PRAGMA mmap_size=268435456',
+)
+
+# One reader per request thread, so a reader is free whenever a thread needs one.
+# SQLITE_POOL_SIZE overrides it; otherwise it follows the gunicorn thread count (WEB_THREADS).
+DEFAULT_POOL_SIZE = int(os.environ.get('SQLITE_POOL_SIZE') or os.environ.get('WEB_THREADS', 4))
+# Seconds acquire() waits for an idle reader before giving up with PoolTimeoutError
+DEFAULT_POOL_TIMEOUT = float(os.environ.get('SQLITE_POOL_TIMEOUT', 5))
+
+class PoolTimeoutError(Exception):
+    """
+    Raised when no pooled connection became free within the pool's timeout.
+    """
+
+class SQLitePool:
+    """
+    A bounded pool of SQLite connections: one dedicated writer plus N readers.
+    Connections are opened once, configured with WAL pragmas and handed out
+    to one thread at a time via acquire().
+    """
+    def __init__(self, database, size=None, timeout=None):
+        self.database = database
+        self.size = size or DEFAULT_POOL_SIZE
+        self.timeout = DEFAULT_POOL_TIMEOUT if timeout is None else timeout
+        self._readers = queue.Queue(maxsize=self.size)
+        self._write_lock = threading.Lock()
+        self._writer = self._connect()
+        for _ in range(self.size):
+            self._readers.put(self._connect())
+        logger.info(f"SQLite pool opened for '{database}' with 1 writer and {self.size} readers.")
+
+    def _connect(self):
+        """
+        Opens and configures a single pooled connection.
+        """
+        # Pooled connections are created on one thread and borrowed by others,
+        # so the same-thread check must stay disabled. acquire() guarantees a
+        # connection is only ever used by one thread at a time.
+        # A larger statement cache keeps every prepared query of the app resident.
+        conn = sqlite3.connect(self.database, check_same_thread=False, cached_statements=256)
+        conn.row_factory = sqlite3.Row # Allows accessing columns by name
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    @contextmanager
+    def acquire(self, write=False):
+        """
+        Borrows a connection for the duration of the with-block.
+        Writes are serialized on the single writer connection; reads take any idle reader.
+        Raises PoolTimeoutError if no connection frees up within the pool's timeout.
+        """
+        if write:
+            if not self._write_lock.acquire(timeout=self.timeout):
+                raise PoolTimeoutError(f"Timed out after {self.timeout}s waiting for the '{self.database}' writer connection.")
+            try:
+                yield self._writer
+            finally:
+                self._write_lock.release()
+            return
+        try:
+            conn = self._readers.get(timeout=self.timeout)
+        except queue.Empty:
+            raise PoolTimeoutError(
+                f"Timed out after {self.timeout}s waiting for one of {self.size} '{self.database}' reader connections."
+            ) from None
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    def close(self):
+        """
+        Closes every connection owned by the pool.
+        """
+        with self._write_lock:
+            if self._writer:
+                self._writer.close()
+                self._writer = None
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+        logger.info(f"SQLite pool for '{self.database}' closed.")
@@ -0,0 +1,23 @@
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+class ORJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider that serializes responses and parses request bodies with orjson
+    instead of the stdlib json module.
+    Types orjson does not handle natively fall back to Flask's default conversions.
+    """
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_NON_STR_KEYS
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        # request.get_json() parses through here. orjson takes the raw request bytes
+        # directly; its JSONDecodeError is a ValueError, so Flask's 400 handling still applies.
+        if kwargs:
+            return super().loads(s, **kwargs) # e.g. object_hook, which orjson doesn't support
+        return orjson.loads(s)
@@ -1,55 +1,153 @@
 # src\middlewares\auth_middleware.py
-from functools import wraps
+from functools import lru_cache
+from typing import Any, Callable, Optional
 from flask import request, jsonify
-import jwt
+import base64
+import binascii
+import hmac
 import os
-from dotenv import load_dotenv
+import time
 import logging
+import orjson
+from src.middlewares.jwt_cache import get_cached_claims, cache_claims
 
 logger = logging.getLogger(__name__)
+# Bound once; the auth-failure paths call it on every rejected request
+_log_warn = logger.warning
 
-load_dotenv()
+DEFAULT_JWT_SECRET_KEY = 'default-jwt-secret-key-change-me'
 
-JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'default-jwt-secret-key-change-me')
+# Claims token_required reads from every token
+_REQUIRED_CLAIMS = ('id', 'email')
 
-if JWT_SECRET_KEY == 'default-jwt-secret-key-change-me':
-    logger.critical("JWT_SECRET_KEY not set in .env. Using default. THIS IS INSECURE FOR PRODUCTION.")
+class InvalidTokenError(Exception):
+    """
+    Raised when a token is malformed, has a bad signature or lacks required claims.
+    """
+
+class ExpiredSignatureError(InvalidTokenError):
+    """
+    Raised when a correctly signed token is past its 'exp' claim.
+    """
+
+def init_auth():
+    """
+    Loads environment variables from .env. Called once by the app at startup.
+    """
+    from dotenv import load_dotenv
+    load_dotenv()
+
+@lru_cache(maxsize=1)
+def _get_secret() -> bytes:
+    """
+    Reads JWT_SECRET_KEY on first use and returns it as bytes, so verification
+    never converts the key from str per request.
+    """
+    secret = os.environ.get('JWT_SECRET_KEY', DEFAULT_JWT_SECRET_KEY)
+    if secret == DEFAULT_JWT_SECRET_KEY:
+        logger.critical("JWT_SECRET_KEY not set in .env. Using default. THIS IS INSECURE FOR PRODUCTION.")
+    return secret.encode()
 
-def token_required(f):
+@lru_cache(maxsize=1)
+def _get_hmac_template() -> 'hmac.HMAC':
+    """
+    HMAC-SHA256 object already keyed with the JWT secret. Each verification copies
+    it instead of re-deriving the inner and outer key pads from the secret.
+    """
+    return hmac.new(_get_secret(), digestmod='sha256')
+
+def _b64url_decode(segment: bytes) -> bytes:
+    """
+    Decodes an unpadded base64url JWT segment.
+    """
+    return base64.urlsafe_b64decode(segment + b'=' * (-len(segment) % 4))
+
+def _verify_hs256(token: str, mac_template: 'hmac.HMAC') -> dict[str, Any]:
+    """
+    Verifies an HS256 JWT (header.payload.signature) and returns its claims.
+    The HMAC runs in OpenSSL via the stdlib hmac module, without PyJWT's Python-level
+    overhead. Raises ExpiredSignatureError or InvalidTokenError.
+    """
+    segments = token.encode().split(b'.')
+    if len(segments) != 3:
+        raise InvalidTokenError('Not enough segments' if len(segments) < 3 else 'Too many segments')
+    header_b64, payload_b64, signature_b64 = segments
+    signing_input = header_b64 + b'.' + payload_b64
+    try:
+        signature = _b64url_decode(signature_b64)
+    except binascii.Error:
+        raise InvalidTokenError('Invalid crypto padding')
+    mac = mac_template.copy()
+    mac.update(signing_input)
+    expected = mac.digest()
+    if not hmac.compare_digest(signature, expected):
+        raise InvalidTokenError('Signature verification failed')
+
+    # Header and payload are only parsed once the signature is known to be ours
+    try:
+        header = orjson.loads(_b64url_decode(header_b64))
+        payload = orjson.loads(_b64url_decode(payload_b64))
+    except ValueError: # covers binascii.Error and orjson.JSONDecodeError
+        raise InvalidTokenError('Invalid token encoding')
+    if not isinstance(header, dict) or header.get('alg') != 'HS256':
+        raise InvalidTokenError('The specified alg value is not allowed')
+    if not isinstance(payload, dict):
+        raise InvalidTokenError('Invalid payload string: must be a json object')
+
+    exp = payload.get('exp')
+    if exp is not None:
+        if isinstance(exp, bool) or not isinstance(exp, (int, float)):
+            raise InvalidTokenError('Expiration Time claim (exp) must be a number.')
+        if exp <= time.time():
+            raise ExpiredSignatureError('Signature has expired')
+    for claim in _REQUIRED_CLAIMS:
+        if claim not in payload:
+            raise InvalidTokenError(f'Token is missing the "{claim}" claim')
+    return payload
+
+def token_required(f: Callable[..., Any]) -> Callable[..., Any]:
     """
     Decorator to ensure that a valid JWT token is present in the request header.
     It extracts the token, decodes it, and passes the decoded user info to the decorated function
     as a keyword argument `current_user`.
     """
-    @wraps(f)
-    def decorated(*args, **kwargs):
-        token = None
-        if 'Authorization' in request.headers:
-            try:
-                auth_header = request.headers['Authorization']
-                if auth_header.startswith('Bearer '):
-                    token = auth_header.split(' ')[1]
-            except IndexError:
-                logger.warning("Malformed Authorization header: 'Bearer ' present but token missing.")
-                return jsonify({'error': 'Malformed Authorization header'}), 401
+    # Names used on the success path are bound as keyword-only defaults, so each
+    # request reads them as fast locals instead of module-global lookups.
+    def decorated(*args: Any, _request: Any = request, _get_cached_claims: Callable[[str], Optional[dict]] = get_cached_claims,
+                  _cache_claims: Callable[[str, dict], None] = cache_claims, _verify: Callable[..., dict] = _verify_hs256,
+                  _mac_template: Callable[[], 'hmac.HMAC'] = _get_hmac_template, **kwargs: Any) -> Any:
+        # Read the header straight from the WSGI environ (skipping the EnvironHeaders
+        # wrapper) and slice off the prefix; no list allocation from split()
+        auth_header: str = _request.environ.get('HTTP_AUTHORIZATION', '')
+        token: Optional[str] = auth_header[7:].strip() if auth_header.startswith('Bearer ') else None
 
         if not token:
-            logger.warning("Authentication Token is missing in request headers.")
+            _log_warn("Authentication Token is missing in request headers.")
             return jsonify({'error': 'Authentication Token is missing!'}), 401
 
         try:
-            data = jwt.decode(token, JWT_SECRET_KEY, algorithms=['HS256'])
+            # Tokens seen recently skip the signature check and JSON parse entirely
+            data = _get_cached_claims(token)
+            if data is None:
+                data = _verify(token, _mac_template())
+                _cache_claims(token, data)
             # Pass current_user as a keyword argument
             kwargs['current_user'] = {'id': data['id'], 'email': data['email']}
-        except jwt.ExpiredSignatureError:
-            logger.warning(f"Expired token attempt from {request.remote_addr}.")
+        except ExpiredSignatureError:
+            _log_warn("Expired token attempt from %s.", _request.remote_addr)
             return jsonify({'error': 'Token has expired'}), 401
-        except jwt.InvalidTokenError as e:
-            logger.warning(f"Invalid token attempt from {request.remote_addr}: {e}")
+        except InvalidTokenError as e:
+            _log_warn("Invalid token attempt from %s: %s", _request.remote_addr, e)
             return jsonify({'error': f'Invalid Token: {str(e)}'}), 401
         except Exception as e:
-            logger.error(f"Unexpected error during token processing from {request.remote_addr}: {e}", exc_info=True)
+            if logger.isEnabledFor(logging.ERROR):
+                logger.error("Unexpected error during token processing from %s: %s", _request.remote_addr, e, exc_info=True)
             return jsonify({'error': 'Token processing failed', 'details': 'An unexpected error occurred.'}), 401
 
         return f(*args, **kwargs) # Call the original function with modified kwargs
+
+    # Copy only the metadata Flask and introspection use, instead of functools.wraps
+    decorated.__name__ = f.__name__
+    decorated.__doc__ = f.__doc__
+    setattr(decorated, '__wrapped__', f) # not a declared attribute of Callable for type checkers
     return decorated
\ No newline at end of file
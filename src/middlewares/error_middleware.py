@@ -1,57 +1,110 @@
-from flask import jsonify, request
+from functools import lru_cache
+from flask import Response, request
 from werkzeug.exceptions import HTTPException
 import logging
+import orjson
 
 logger = logging.getLogger(__name__)
 
-def register_error_handlers(app):
+# Bodies that never change are serialized once instead of on every error
+_INTERNAL_ERROR_BODY = orjson.dumps({'error': 'Internal Server Error', 'message': 'Something went wrong on our side.'})
+_UNEXPECTED_ERROR_BODY = orjson.dumps({'error': 'An unexpected error occurred', 'message': 'Please try again later.'})
+
+def _build_error_message_body(error_title, code, name, description):
+    """
+    Serialized {'error', 'message'} body, where message is what str(error) would give.
+    """
+    return orjson.dumps({'error': error_title, 'message': f"{code} {name}: {description}"})
+
+def _build_http_error_body(code, name, description):
+    """
+    Serialized body for generic HTTP exceptions.
     """
-    Registers custom error handlers for common HTTP status codes and general exceptions.
-    """
-
-    @app.errorhandler(404)
-    def not_found(error):
-        """Handles 404 Not Found errors."""
-        logger.warning(f"404 Not Found: {request.url}")
-        return jsonify({'error': 'Resource Not Found', 'message': str(error)}), 404
-
-    @app.errorhandler(400)
-    def bad_request(error):
-        """Handles 400 Bad Request errors."""
-        # This typically catches Flask's internal parsing errors (e.g., malformed JSON).
-        # Specific validation errors from controllers should return 400 with a custom message.
-        logger.warning(f"400 Bad Request: {request.url} - {error}")
-        return jsonify({'error': 'Bad Request', 'message': str(error)}), 400
-
-    @app.errorhandler(405)
-    def method_not_allowed(error):
-        """Handles 405 Method Not Allowed errors."""
-        logger.warning(f"405 Method Not Allowed: {request.method} on {request.url}")
-        return jsonify({'error': 'Method Not Allowed', 'message': str(error)}), 405
-
-    @app.errorhandler(500)
-    def internal_error(error):
-        """Handles 500 Internal Server Error."""
-        # Log the actual error for debugging in production
+    return orjson.dumps({
+        "code": code,
+        "name": name,
+        "description": description,
+        "message": "An HTTP error occurred."
+    })
+
+_cached_error_message_body = lru_cache(maxsize=64)(_build_error_message_body)
+_cached_http_error_body = lru_cache(maxsize=64)(_build_http_error_body)
+
+def _has_default_description(error):
+    """
+    True when the exception carries its class's standard description.
+    Only those bodies are cached: a custom description (e.g. from abort(400, description=...))
+    varies per request and may not even be hashable.
+    """
+    return error.description is type(error).description
+
+def _error_message_body(error_title, error):
+    """{'error', 'message'} body for an exception, cached for standard descriptions."""
+    if _has_default_description(error):
+        return _cached_error_message_body(error_title, error.code, error.name, error.description)
+    return _build_error_message_body(error_title, error.code, error.name, error.description)
+
+def _http_error_body(error):
+    """Generic HTTP exception body, cached for standard descriptions."""
+    if _has_default_description(error):
+        return _cached_http_error_body(error.code, error.name, error.description)
+    return _build_http_error_body(error.code, error.name, error.description)
+
+def _not_found_body(error):
+    """Body for 404 Not Found errors."""
+    logger.warning("404 Not Found: %s", request.url)
+    return _error_message_body('Resource Not Found', error)
+
+def _bad_request_body(error):
+    """Body for 400 Bad Request errors."""
+    # This typically catches Flask's internal parsing errors (e.g., malformed JSON).
+    # Specific validation errors from controllers should return 400 with a custom message.
+    logger.warning("400 Bad Request: %s - %s", request.url, error)
+    return _error_message_body('Bad Request', error)
+
+def _method_not_allowed_body(error):
+    """Body for 405 Method Not Allowed errors."""
+    logger.warning("405 Method Not Allowed: %s on %s", request.method, request.url)
+    return _error_message_body('Method Not Allowed', error)
+
+def _internal_error_body(error):
+    """Body for 500 Internal Server Error."""
+    # Log the actual error for debugging in production. Formatting the traceback is
+    # costly, so skip it entirely when ERROR logging is disabled.
+    if logger.isEnabledFor(logging.ERROR):
         logger.exception(f"500 Internal Server Error: {error}") # Logs traceback
-        return jsonify({'error': 'Internal Server Error', 'message': 'Something went wrong on our side.'}), 500
+    return _INTERNAL_ERROR_BODY
+
+def _http_exception_body(e):
+    """
+    Body for any other Werkzeug HTTPException (e.g., 401, 403, etc.).
+    """
+    logger.warning("HTTP Exception %s: %s", e.code, e.description)
+    return _http_error_body(e)
+
+# Status codes with a dedicated body; everything else uses _http_exception_body
+_BODY_BUILDERS = {
+    400: _bad_request_body,
+    404: _not_found_body,
+    405: _method_not_allowed_body,
+    500: _internal_error_body,
+}
+
+def register_error_handlers(app):
+    """
+    Registers custom error handlers for HTTP errors and general exceptions.
+    """
 
     @app.errorhandler(HTTPException)
     def handle_http_exception(e):
         """
-        Catch all Werkzeug HTTPExceptions (e.g., 401, 403, etc.) not specifically handled.
-        This provides a consistent JSON error response for these exceptions.
+        Single handler for all Werkzeug HTTPExceptions (404, 400, 405, 500, 401, 403, etc.).
+        The body is picked from a per-status table, providing a consistent JSON error response.
         """
-        logger.warning(f"HTTP Exception {e.code}: {e.description}")
-        response = e.get_response()
-        response.data = jsonify({
-            "code": e.code,
-            "name": e.name,
-            "description": e.description,
-            "message": "An HTTP error occurred."
-        }).get_data(as_text=True)
-        response.content_type = "application/json"
-        return response
+        body = _BODY_BUILDERS.get(e.code, _http_exception_body)(e)
+        # Keep headers the exception defines (e.g. Allow on 405), but not its HTML content type
+        headers = [(name, value) for name, value in e.get_headers() if name.lower() != 'content-type']
+        return Response(body, status=e.code, headers=headers, mimetype='application/json')
 
     @app.errorhandler(Exception)
     def handle_unexpected_error(e):
@@ -59,5 +112,6 @@ def register_error_handlers(app):
         Catch-all for any uncaught exceptions. This prevents the server from crashing
         and provides a generic 500 error message to the client while logging details.
         """
-        logger.exception(f"An unexpected error occurred: {e}")
-        return jsonify({'error': 'An unexpected error occurred', 'message': 'Please try again later.'}), 500
\ No newline at end of file
+        if logger.isEnabledFor(logging.ERROR):
+            logger.exception(f"An unexpected error occurred: {e}")
+        return Response(_UNEXPECTED_ERROR_BODY, status=500, mimetype='application/json')
\ No newline at end of file
@@ -0,0 +1,46 @@
+# src\middlewares\jwt_cache.py
+import hashlib
+import threading
+import time
+from cachetools import TLRUCache
+
+# Decoded claims are kept for at most this many seconds, or until the token's
+# own 'exp' claim if that comes sooner.
+JWT_CACHE_MAXSIZE = 4096
+JWT_CACHE_TTL = 3600
+
+def _time_to_use(key, value, now):
+    """
+    Expiry for a cache entry: the default TTL, bounded by the token's 'exp' claim.
+    """
+    expires_at = now + JWT_CACHE_TTL
+    exp = value.get('exp')
+    if isinstance(exp, (int, float)):
+        expires_at = min(expires_at, exp)
+    return expires_at
+
+# time.time is used as the timer so entry expiry is comparable with 'exp'.
+_cache = TLRUCache(maxsize=JWT_CACHE_MAXSIZE, ttu=_time_to_use, timer=time.time)
+_lock = threading.Lock() # cachetools caches are not thread-safe
+
+def _cache_key(token):
+    """
+    Fixed-size key so memory use does not depend on token length.
+    """
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+def get_cached_claims(token):
+    """
+    Returns the previously verified claims for a token, or None on a miss.
+    """
+    key = _cache_key(token)
+    with _lock:
+        return _cache.get(key)
+
+def cache_claims(token, claims):
+    """
+    Stores the claims of a successfully verified token.
+    """
+    key = _cache_key(token)
+    with _lock:
+        _cache[key] = claims